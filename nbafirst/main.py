@@ -26,7 +26,7 @@ def main():
     
     # Initial data scraping
     logger.info("Performing initial data scraping...")
-    scraper.scrape_season_data()
+    data_digest = scraper.scrape_season_data()
     
     # Train initial model
     logger.info("Training initial model...")
@@ -40,7 +40,7 @@ def main():
     asyncio.set_event_loop(loop)
     
     # Start the scheduler within the event loop
-    loop.create_task(scheduler.start(scraper, predictor))
+    loop.create_task(scheduler.start(scraper, predictor, data_digest))
     
     try:
         # Keep the application running
@@ -48,9 +48,10 @@ def main():
     except KeyboardInterrupt:
         logger.info("Application stopped by user")
     except Exception as e:
-        logger.error(f"Application error: {e}")
+        logger.error("Application error: %s", e)
     finally:
         scheduler.stop()
+        scraper.close()
         loop.close()
         logger.info("Application shutdown complete")
 
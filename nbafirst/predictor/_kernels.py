@@ -0,0 +1,34 @@
+import numpy as np
+
+try:
+    from numba import njit  # type: ignore
+except ImportError:  # pragma: no cover - optional accelerator
+    njit = None
+
+
+def _weighted_pick(probs: np.ndarray, u: float) -> int:
+    """Return the index selected by uniform draw ``u`` in [0, 1) over ``probs``.
+
+    Falls back to a uniform pick when every weight is zero.
+    """
+    size = probs.shape[0]
+    total = 0.0
+    for i in range(size):
+        total += probs[i]
+
+    if total <= 0.0:
+        return min(int(u * size), size - 1)
+
+    target = u * total
+    accumulated = 0.0
+    for i in range(size):
+        accumulated += probs[i]
+        if accumulated > target:
+            return i
+    return size - 1
+
+
+if njit is not None:
+    weighted_pick = njit(cache=True)(_weighted_pick)
+else:  # pragma: no cover - exercised only without numba
+    weighted_pick = _weighted_pick
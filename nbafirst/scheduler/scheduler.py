@@ -9,13 +9,20 @@ class ScheduleManager:
         self.running = False
         self.scraper_task = None
         self.prediction_task = None
+        self._last_data_digest = None
+        self._last_prediction_key = None
     
-    async def start(self, scraper, predictor):
-        """Start the scheduler"""
+    async def start(self, scraper, predictor, data_digest=None):
+        """Start the scheduler
+
+        ``data_digest`` is the result of the scrape the predictor was last
+        trained on, so an unchanged first periodic scrape does not retrain.
+        """
         self.running = True
+        self._last_data_digest = data_digest
         
         # Start background tasks
-        self.scraper_task = asyncio.create_task(self._scrape_data_periodically(scraper))
+        self.scraper_task = asyncio.create_task(self._scrape_data_periodically(scraper, predictor))
         self.prediction_task = asyncio.create_task(self._make_predictions_periodically(predictor, scraper))
         
         logger.info("Scheduler started")
@@ -38,21 +45,31 @@ class ScheduleManager:
         
         logger.info("Scheduler stopped")
     
-    async def _scrape_data_periodically(self, scraper):
-        """Scrape data every 24 hours"""
+    async def _scrape_data_periodically(self, scraper, predictor):
+        """Scrape data every 24 hours and retrain when it changed"""
         while self.running:
             try:
                 logger.info("Starting periodic data scraping")
-                scraper.scrape_season_data()
+                data_digest = scraper.scrape_season_data()
                 logger.info("Data scraping completed")
                 
+                if data_digest != self._last_data_digest or not predictor.trained:
+                    logger.info("Scraped data changed or model untrained, retraining model")
+                    predictor.train_model()
+                    # Only remember the digest once training succeeded so a
+                    # failed run is retried after the next scrape.
+                    if predictor.trained:
+                        self._last_data_digest = data_digest
+                else:
+                    logger.info("Scraped data unchanged, keeping current model")
+                
                 # Wait for 24 hours
                 await asyncio.sleep(24 * 60 * 60)
             except asyncio.CancelledError:
                 logger.info("Data scraping task cancelled")
                 break
             except Exception as e:
-                logger.error(f"Error in data scraping: {e}")
+                logger.error("Error in data scraping: %s", e)
                 # Wait 1 hour before retrying
                 await asyncio.sleep(60 * 60)
     
@@ -65,6 +82,16 @@ class ScheduleManager:
                 # Get today's games
                 games = scraper.get_todays_games()
                 
+                # Skip the pass if neither the slate nor the model has changed
+                prediction_key = (
+                    tuple((game["home_team"], game["away_team"]) for game in games),
+                    predictor.model_data.get("last_updated"),
+                )
+                if prediction_key == self._last_prediction_key:
+                    logger.info("Games and model unchanged, skipping predictions")
+                    await asyncio.sleep(60 * 60)
+                    continue
+                
                 # Make predictions for each game
                 for game in games:
                     prediction = predictor.predict_first_basket(
@@ -72,9 +99,15 @@ class ScheduleManager:
                         game["away_team"]
                     )
                     
-                    logger.info(f"\nGame: {game['away_team']} @ {game['home_team']}")
-                    logger.info(f"Predicted first basket: {prediction['player']} ({prediction['team']})")
-                    logger.info(f"Probability: {prediction['probability']:.2%} (Confidence: {prediction['confidence']})")
+                    logger.info("\nGame: %s @ %s", game["away_team"], game["home_team"])
+                    logger.info("Predicted first basket: %s (%s)", prediction["player"], prediction["team"])
+                    logger.info(
+                        "Probability: %.2f%% (Confidence: %s)",
+                        prediction["probability"] * 100,
+                        prediction["confidence"],
+                    )
+                
+                self._last_prediction_key = prediction_key
                 
                 # Wait for 1 hour
                 await asyncio.sleep(60 * 60)
@@ -82,6 +115,6 @@ class ScheduleManager:
                 logger.info("Prediction task cancelled")
                 break
             except Exception as e:
-                logger.error(f"Error in predictions: {e}")
+                logger.error("Error in predictions: %s", e)
                 # Wait 10 minutes before retrying
                 await asyncio.sleep(10 * 60)
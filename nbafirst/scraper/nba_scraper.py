@@ -1,18 +1,167 @@
+import hashlib
 import json
 import logging
 import os
+import re
 import sqlite3
+import threading
 import time
-from datetime import date, datetime, timezone
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from nba_api.live.nba.endpoints import playbyplay as live_playbyplay  # type: ignore
 from nba_api.live.nba.endpoints import scoreboard as live_scoreboard  # type: ignore
+from nba_api.live.nba.library.http import NBALiveHTTP  # type: ignore
+from nba_api.stats.library.http import NBAStatsHTTP  # type: ignore
 from nba_api.stats.endpoints import leaguegamelog, playbyplayv2  # type: ignore
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+try:
+    import requests_cache  # type: ignore
+except ImportError:  # pragma: no cover - optional HTTP cache
+    requests_cache = None
+
 logger = logging.getLogger(__name__)
 
+# Play-by-play for a finished game never changes, so cached responses can be
+# served for a long time; schedules and scoreboards are never cached.
+HTTP_CACHE_EXPIRY = timedelta(days=30)
+
+# Snapshots are read by the predictor, not people, so they are written compact
+# unless NBAFIRST_PRETTY_JSON=1 (e.g. when debugging an export).
+PRETTY_JSON = os.environ.get("NBAFIRST_PRETTY_JSON", "").strip().lower() in {"1", "true", "yes"}
+
+# The LeagueGameLog columns the schedule parser reads.
+SCHEDULE_COLUMNS = ("GAME_ID", "MATCHUP", "TEAM_ABBREVIATION", "GAME_DATE")
+
+# LeagueGameLog MATCHUP values look like "LAL vs. GSW" (home) or "LAL @ GSW"
+# (away); one pass captures both the venue marker and the opponent.
+MATCHUP_RE = re.compile(r" (vs\.|@) (.*)$")
+
+# Game clocks arrive as "11:45" from the stats API and as "PT11M45.00S" from
+# the live feed.
+CLOCK_RE = re.compile(r"^\s*(?:(\d+):(\d+(?:\.\d+)?)|PT(\d+)M(\d+(?:\.\d+)?)S)\s*$")
+
+# Raw-body markers for the play-by-play cache filter: where the PlayByPlay
+# result set starts, where the next result set starts, and the "N - M" SCORE
+# strings that only scoring plays carry.
+PLAY_BY_PLAY_SET_RE = re.compile(rb'"name"\s*:\s*"PlayByPlay"')
+RESULT_SET_NAME_RE = re.compile(rb'"name"\s*:')
+SCORE_RE = re.compile(rb'"(\d+) - (\d+)"')
+
+# Upserts are flushed and committed in batches of this size so a season scrape
+# pays for one transaction per batch rather than one per game.
+UPSERT_BATCH_SIZE = 500
+
+# Play-by-play requests are latency bound, so several are kept in flight while
+# the shared rate limiter still spaces out when each one is sent.
+PBP_FETCH_WORKERS = 8
+BALLDONTLIE_PAGE_WORKERS = 4
+
+# Per-connection tuning: WAL makes synchronous=NORMAL safe (one fsync per
+# checkpoint instead of two per commit) and mmap lets reads skip read() calls.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+UPSERT_GAME_SQL = """
+    INSERT INTO games (
+        game_id,
+        season,
+        game_date,
+        home_team,
+        away_team,
+        first_scoring_team,
+        first_scoring_player,
+        first_scoring_player_id,
+        first_scoring_description,
+        first_scoring_elapsed,
+        source_url,
+        last_updated
+    ) VALUES (:game_id, :season, :game_date, :home_team, :away_team, :first_scoring_team,
+              :first_scoring_player, :first_scoring_player_id, :first_scoring_description,
+              :first_scoring_elapsed, :source_url, :last_updated)
+    ON CONFLICT(game_id) DO UPDATE SET
+        season = excluded.season,
+        game_date = excluded.game_date,
+        home_team = excluded.home_team,
+        away_team = excluded.away_team,
+        first_scoring_team = excluded.first_scoring_team,
+        first_scoring_player = excluded.first_scoring_player,
+        first_scoring_player_id = excluded.first_scoring_player_id,
+        first_scoring_description = excluded.first_scoring_description,
+        first_scoring_elapsed = excluded.first_scoring_elapsed,
+        source_url = excluded.source_url,
+        last_updated = excluded.last_updated
+"""
+
+
+def _decode_json(response: requests.Response):
+    """Decode a JSON response body, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _is_cacheable_response(response: requests.Response) -> bool:
+    """Only cache stats play-by-play responses that already contain a basket.
+
+    Responses for games that have not tipped off, or whose opening plays are
+    all misses, must not be replayed from the cache once someone has scored.
+    """
+    if "playbyplayv2" not in response.url.lower():
+        return False
+    # Scan the raw body; nba_api decodes it anyway, so parsing it here too
+    # would double the JSON work on every play-by-play fetch.
+    body = response.content
+    start = PLAY_BY_PLAY_SET_RE.search(body)
+    if start is None:
+        return False
+    next_set = RESULT_SET_NAME_RE.search(body, start.end())
+    end = next_set.start() if next_set else len(body)
+    return any(
+        score.group(1) != b"0" or score.group(2) != b"0"
+        for score in SCORE_RE.finditer(body, start.end(), end)
+    )
+
+
+@lru_cache(maxsize=4096)
+def _calculate_elapsed_seconds(clock: str, period: int, period_type: str) -> float:
+    """Seconds elapsed in the game at ``clock`` remaining in ``period``.
+
+    Accepts both the stats ``"MM:SS"`` clock and the live feed's ISO-8601
+    ``"PT11M45.00S"`` duration. Scoring clocks cluster on a handful of
+    values, so results are memoised.
+    """
+    match = CLOCK_RE.match(clock) if isinstance(clock, str) else None
+    if match:
+        minutes = int(match.group(1) or match.group(3))
+        seconds = float(match.group(2) or match.group(4))
+    else:
+        minutes = 12
+        seconds = 0.0
+
+    period_length = 12 * 60
+    if period > 4 or str(period_type).upper() == "OVERTIME":
+        period_length = 5 * 60
+
+    elapsed_in_period = period_length - (minutes * 60 + seconds)
+    total_elapsed = elapsed_in_period + max(0, period - 1) * 12 * 60
+    return round(total_elapsed, 2)
+
 
 class NBAScraper:
     """Collect NBA play-by-play data using official and community APIs."""
@@ -22,7 +171,9 @@ class NBAScraper:
     def __init__(self) -> None:
         self.data_dir = "data"
         self.db_path = os.path.join(self.data_dir, "first_baskets.db")
-        self.session = requests.Session()
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        self.session = self._create_session()
         self.session.headers.update(
             {
                 "User-Agent": (
@@ -32,21 +183,51 @@ class NBAScraper:
                 )
             }
         )
+        self._share_session_with_nba_api()
         self.min_request_interval = 0.75
         self._last_request_timestamp: float = 0.0
+        self._rate_limit_lock = threading.Lock()
+        self._processed_ids: Set[str] = set()
 
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir, exist_ok=True)
-
+        # One connection for the scraper's lifetime. Only the scraping thread
+        # touches it (fetch workers never do), so sharing it across threads
+        # is safe.
+        self._conn = self._connect()
         self._initialise_database()
+        # Snapshot encoding and writes run here so the next season's fetches
+        # can start while the previous season is still being written.
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="export-writer")
+
+    def close(self) -> None:
+        """Close the scraper's database connection and HTTP session."""
+        self._io_pool.shutdown(wait=True)
+        self._conn.close()
+        self.session.close()
+
+    def __enter__(self) -> "NBAScraper":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
-    def scrape_season_data(self) -> None:
-        """Scrape play-by-play data for the current and previous NBA seasons."""
-
-        current_season_start = self._get_current_season_start_year()
+    def scrape_season_data(self) -> str:
+        """Scrape play-by-play data for the current and previous NBA seasons.
+
+        Returns a digest of the exported season files so callers can tell
+        whether anything changed since the previous scrape.
+        """
+
+        digest = hashlib.sha256()
+        exports: List[Future] = []
+        # One clock reading for the whole run: every game is judged against the
+        # same day and every record gets the same scrape timestamp.
+        now = datetime.now()
+        today = now.date()
+        scraped_at = now.astimezone(timezone.utc).isoformat()
+        current_season_start = self._get_current_season_start_year(today)
         seasons = [current_season_start - 1, current_season_start]
 
         for season_start in seasons:
@@ -65,16 +246,51 @@ class NBAScraper:
                 )
                 schedule_games = self._fetch_schedule_from_balldontlie(season_start)
 
+            self._processed_ids = self._load_processed_ids(season_label)
             processed_games = 0
-            for game in schedule_games:
-                if not self._should_process_game(game):
-                    continue
+            pending_records: List[Dict] = []
+            pending_games = [
+                game for game in schedule_games if self._should_process_game(game, today)
+            ]
+            # Workers only fetch and build records; this thread stays the
+            # single SQLite writer.
+            executor = ThreadPoolExecutor(
+                max_workers=PBP_FETCH_WORKERS, thread_name_prefix="pbp-fetch"
+            )
+            futures = [
+                executor.submit(self._process_game, game, season_label, scraped_at)
+                for game in pending_games
+            ]
+            try:
+                for future in futures:
+                    record = future.result()
+                    if record is None:
+                        continue
 
-                if self._process_game(game, season_label):
+                    pending_records.append(record)
                     processed_games += 1
+                    if len(pending_records) >= UPSERT_BATCH_SIZE:
+                        self._upsert_game_records(pending_records)
+                        pending_records.clear()
+            finally:
+                # On an error or interrupt, cancel the queued fetches rather
+                # than waiting for all of them, and keep what was fetched.
+                executor.shutdown(wait=True, cancel_futures=True)
+                self._upsert_game_records(pending_records)
+                pending_records.clear()
+
+            if processed_games:
+                # Refresh planner statistics so the season indexes are used
+                # once the table has grown.
+                self._conn.execute("ANALYZE games")
 
             logger.info("Processed %d games for season %s", processed_games, season_label)
-            self._export_season_files(season_label)
+            exports.append(self._export_season_files(season_label))
+
+        # Fold the season digests in order once their writes have finished.
+        for export in exports:
+            digest.update(export.result())
+        return digest.hexdigest()
 
     def get_todays_games(self) -> List[Dict]:
         """Return today's NBA games using NBA and balldontlie APIs."""
@@ -88,9 +304,56 @@ class NBAScraper:
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _create_session(self) -> requests.Session:
+        if requests_cache is None:
+            session = requests.Session()
+        else:
+            session = requests_cache.CachedSession(
+                os.path.join(self.data_dir, "http_cache"),
+                backend="sqlite",
+                expire_after=HTTP_CACHE_EXPIRY,
+                allowable_codes=(200,),
+                filter_fn=_is_cacheable_response,
+            )
+
+        # stats.nba.com regularly times out or throttles; retry those with
+        # exponential backoff (honouring Retry-After) instead of dropping the
+        # game until the next scrape.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=16)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _share_session_with_nba_api(self) -> None:
+        """Route nba_api's stats and live requests through ``self.session``.
+
+        Keeping one pooled session lets every endpoint call reuse open
+        keep-alive connections instead of handshaking per request. nba_api
+        still sends its own headers with each request.
+        """
+        for http_client in (NBAStatsHTTP, NBALiveHTTP):
+            set_session = getattr(http_client, "set_session", None)
+            if set_session is None:  # pragma: no cover - older nba_api releases
+                logger.debug("%s does not accept a shared session", http_client.__name__)
+                continue
+            set_session(self.session)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
     def _initialise_database(self) -> None:
-        os.makedirs(self.data_dir, exist_ok=True)
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn as conn:
+            # journal_mode is persistent, so switching to WAL once is enough.
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS games (
@@ -109,9 +372,18 @@ class NBAScraper:
                 )
                 """
             )
+            # Exports filter every query by season, read games in date order
+            # and group players by team. (season, game_date) also serves plain
+            # season lookups.
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_games_season_date ON games(season, game_date)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_games_season_team "
+                "ON games(season, first_scoring_team)"
+            )
 
-    def _get_current_season_start_year(self) -> int:
-        today = datetime.now()
+    def _get_current_season_start_year(self, today: date) -> int:
         if today.month >= 10:
             return today.year
         return today.year - 1
@@ -120,10 +392,17 @@ class NBAScraper:
         return f"{season_start}-{(season_start + 1) % 100:02d}"
 
     def _respect_rate_limit(self) -> None:
-        elapsed = time.time() - self._last_request_timestamp
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self._last_request_timestamp = time.time()
+        """Block until this thread's request slot comes up.
+
+        Slots are handed out under a lock so concurrent callers stay
+        ``min_request_interval`` apart; the sleep itself happens unlocked.
+        """
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            slot = max(now, self._last_request_timestamp + self.min_request_interval)
+            self._last_request_timestamp = slot
+        if slot > now:
+            time.sleep(slot - now)
 
     def _fetch_schedule_from_nba_api(self, season_label: str) -> List[Dict]:
         """Fetch a season schedule via the official nba_api client."""
@@ -133,70 +412,69 @@ class NBAScraper:
             season=season_label,
             season_type_all_star="Regular Season",
         )
-        frame = log.get_data_frames()[0]
-
-        games: Dict[str, Dict] = {}
-        for _, row in frame.iterrows():
-            game_id = str(row.get("GAME_ID"))
-            matchup = row.get("MATCHUP", "")
-            team = row.get("TEAM_ABBREVIATION")
-            game_date = row.get("GAME_DATE")
-
-            if not game_id or not matchup or not team or not game_date:
-                continue
-
-            try:
-                parsed_date = datetime.strptime(game_date, "%b %d, %Y").date()
-            except ValueError:
-                continue
-
-            game_entry = games.setdefault(
-                game_id,
-                {
-                    "game_id": game_id,
-                    "game_date": parsed_date,
-                    "home_team": None,
-                    "away_team": None,
-                },
+        # Only the game log result set is needed, and only four of its ~30
+        # columns; project straight away so the wide frame is never kept.
+        rows = log.league_game_log.get_data_frame()[list(SCHEDULE_COLUMNS)].dropna()
+
+        # Each game appears twice (once per team); parse every row at once and
+        # then collapse the pairs by GAME_ID.
+        rows = rows[rows["MATCHUP"].astype(bool) & rows["TEAM_ABBREVIATION"].astype(bool)]
+        game_dates = pd.to_datetime(rows["GAME_DATE"], format="%b %d, %Y", errors="coerce")
+
+        team = rows["TEAM_ABBREVIATION"]
+        parts = rows["MATCHUP"].str.extract(MATCHUP_RE)
+        venue, opponent = parts[0], parts[1]
+        is_home = venue == "vs."
+        is_away = venue == "@"
+
+        parsed = pd.DataFrame(
+            {
+                "game_id": rows["GAME_ID"].astype(str),
+                "game_date": game_dates.dt.date,
+                "home_team": team.where(is_home, opponent),
+                "away_team": opponent.where(is_home, team),
+            }
+        )[(is_home | is_away) & game_dates.notna()]
+
+        games = (
+            parsed.groupby("game_id", sort=False)
+            .agg(
+                game_date=("game_date", "first"),
+                home_team=("home_team", "last"),
+                away_team=("away_team", "last"),
             )
-
-            if "vs." in matchup:
-                game_entry["home_team"] = team
-                game_entry["away_team"] = matchup.split(" vs. ", 1)[1]
-            elif "@" in matchup:
-                game_entry["home_team"] = matchup.split(" @ ", 1)[1]
-                game_entry["away_team"] = team
-
-        filtered_games = [game for game in games.values() if game["home_team"] and game["away_team"]]
-        return sorted(filtered_games, key=lambda g: (g["game_date"], g["game_id"]))
+            .reset_index()
+        )
+        games = games[games["home_team"].astype(bool) & games["away_team"].astype(bool)]
+        return games.sort_values(["game_date", "game_id"]).to_dict("records")
 
     def _fetch_schedule_from_balldontlie(self, season_start: int) -> List[Dict]:
         """Fallback schedule retrieval using the balldontlie community API."""
 
-        games: List[Dict] = []
-        page = 1
-        while True:
-            params = {
-                "seasons[]": season_start,
-                "per_page": 100,
-                "page": page,
-                "postseason": "false",
-            }
-            try:
-                self._respect_rate_limit()
-                response = self.session.get(
-                    self.BALLDONTLIE_GAMES_ENDPOINT,
-                    params=params,
-                    timeout=20,
+        first_page = self._fetch_balldontlie_page(season_start, 1)
+        if first_page is None:
+            return []
+
+        payloads = [first_page]
+        total_pages = int(first_page.get("meta", {}).get("total_pages", 1))
+        if total_pages > 1:
+            # The page count is known up front, so the rest can be requested
+            # together; the shared rate limiter still spaces the calls.
+            with ThreadPoolExecutor(
+                max_workers=BALLDONTLIE_PAGE_WORKERS, thread_name_prefix="bdl-pages"
+            ) as executor:
+                payloads.extend(
+                    executor.map(
+                        lambda page: self._fetch_balldontlie_page(season_start, page),
+                        range(2, total_pages + 1),
+                    )
                 )
-                response.raise_for_status()
-            except requests.RequestException as exc:
-                logger.error("balldontlie schedule request failed: %s", exc)
-                break
-
-            payload = response.json()
-            data = payload.get("data", [])
-            for item in data:
+
+        games: List[Dict] = []
+        for payload in payloads:
+            if payload is None:
+                continue
+            for item in payload.get("data", []):
                 try:
                     parsed_date = datetime.fromisoformat(item["date"].replace("Z", "+00:00")).date()
                 except (KeyError, ValueError, TypeError):
@@ -211,32 +489,50 @@ class NBAScraper:
                     }
                 )
 
-            meta = payload.get("meta", {})
-            if page >= int(meta.get("total_pages", page)):
-                break
-            page += 1
-
         filtered_games = [game for game in games if game["home_team"] and game["away_team"]]
         return sorted(filtered_games, key=lambda g: (g["game_date"], g["game_id"]))
 
-    def _should_process_game(self, game: Dict) -> bool:
+    def _fetch_balldontlie_page(self, season_start: int, page: int) -> Optional[Dict]:
+        params = {
+            "seasons[]": season_start,
+            "per_page": 100,
+            "page": page,
+            "postseason": "false",
+        }
+        try:
+            self._respect_rate_limit()
+            response = self.session.get(
+                self.BALLDONTLIE_GAMES_ENDPOINT,
+                params=params,
+                timeout=20,
+            )
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            logger.error("balldontlie schedule request failed for page %d: %s", page, exc)
+            return None
+
+        return _decode_json(response)
+
+    def _should_process_game(self, game: Dict, today: date) -> bool:
         game_date = game.get("game_date")
         if not isinstance(game_date, date):
             return False
 
-        if game_date > datetime.now().date():
+        if game_date > today:
             return False
 
         game_id = game.get("game_id")
         if not game_id:
             return False
 
-        return not self._game_already_processed(game_id)
+        return game_id not in self._processed_ids
 
-    def _process_game(self, game: Dict, season_label: str) -> bool:
+    def _process_game(
+        self, game: Dict, season_label: str, scraped_at: str
+    ) -> Optional[Dict]:
         game_id = game.get("game_id")
         if not game_id:
-            return False
+            return None
 
         first_event = self._fetch_first_event_from_nba_api(game_id)
         if not first_event:
@@ -244,19 +540,17 @@ class NBAScraper:
 
         if not first_event:
             logger.debug("No scoring event found for game %s", game_id)
-            return False
+            return None
 
-        record = self._build_game_record(game, season_label, first_event)
-        self._upsert_game_record(record)
-        return True
+        return self._build_game_record(game, season_label, first_event, scraped_at)
 
-    def _game_already_processed(self, game_id: str) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute(
-                "SELECT game_id FROM games WHERE game_id = ?",
-                (game_id,),
-            ).fetchone()
-            return row is not None
+    def _load_processed_ids(self, season_label: str) -> Set[str]:
+        """Return the ids of every game already stored for ``season_label``."""
+        rows = self._conn.execute(
+            "SELECT game_id FROM games WHERE season = ?",
+            (season_label,),
+        )
+        return {row[0] for row in rows}
 
     def _fetch_first_event_from_nba_api(self, game_id: str) -> Optional[Dict]:
         """Fetch the first scoring event using nba_api.stats play-by-play."""
@@ -269,33 +563,43 @@ class NBAScraper:
             logger.warning("nba_api play-by-play request failed for %s: %s", game_id, exc)
             return None
 
-        for _, row in frame.iterrows():
-            score = row.get("SCORE")
-            if not score or score.strip() in {"", "0 - 0"}:
-                continue
-
-            team = row.get("PLAYER1_TEAM_ABBREVIATION")
-            player = row.get("PLAYER1_NAME")
-            description = (
-                row.get("HOMEDESCRIPTION")
-                or row.get("VISITORDESCRIPTION")
-                or row.get("NEUTRALDESCRIPTION")
-            )
+        if frame.empty:
+            return None
 
-            if not team or not player or not description:
-                continue
+        # Locate the first attributed scoring row with column-wise masks rather
+        # than materialising a Series per event.
+        score = frame["SCORE"].fillna("").astype(str).str.strip()
+        team = frame["PLAYER1_TEAM_ABBREVIATION"].fillna("").astype(str)
+        player = frame["PLAYER1_NAME"].fillna("").astype(str)
+        home_description = frame["HOMEDESCRIPTION"].fillna("").astype(str)
+        visitor_description = frame["VISITORDESCRIPTION"].fillna("").astype(str)
+        neutral_description = frame["NEUTRALDESCRIPTION"].fillna("").astype(str)
+        description = home_description.where(
+            home_description != "",
+            visitor_description.where(visitor_description != "", neutral_description),
+        )
 
-            return {
-                "team": team,
-                "player": player,
-                "player_id": str(row.get("PLAYER1_ID")) if row.get("PLAYER1_ID") else None,
-                "description": description,
-                "clock": row.get("PCTIMESTRING", "12:00"),
-                "period": int(row.get("PERIOD", 1)),
-                "periodType": "REGULAR",
-            }
+        mask = (
+            (score != "")
+            & (score != "0 - 0")
+            & (team != "")
+            & (player != "")
+            & (description != "")
+        ).to_numpy()
+        if not mask.any():
+            return None
 
-        return None
+        position = int(mask.argmax())
+        row = frame.iloc[position]
+        return {
+            "team": team.iloc[position],
+            "player": player.iloc[position],
+            "player_id": str(row.get("PLAYER1_ID")) if row.get("PLAYER1_ID") else None,
+            "description": description.iloc[position],
+            "clock": row.get("PCTIMESTRING", "12:00"),
+            "period": int(row.get("PERIOD", 1)),
+            "periodType": "REGULAR",
+        }
 
     def _fetch_first_event_from_live_feed(self, game_id: str) -> Optional[Dict]:
         """Fallback to the nba_api live feed if stats API is unavailable."""
@@ -317,29 +621,39 @@ class NBAScraper:
             return None
 
         for action in actions:
-            try:
-                score_value = int(action.get("scoreValue", 0))
-            except (TypeError, ValueError):
-                score_value = 0
+            get = action.get
+            # Most actions are non-scoring and carry no (or a zero) scoreValue;
+            # skip those before paying for any conversion. The live feed
+            # already sends ints, so int() is only needed for odd payloads.
+            score_value = get("scoreValue")
+            if not score_value:
+                continue
+
+            if not isinstance(score_value, int):
+                try:
+                    score_value = int(score_value)
+                except (TypeError, ValueError):
+                    continue
 
             if score_value <= 0:
                 continue
 
-            team = action.get("teamTricode")
-            player = action.get("playerName") or action.get("playerNameI")
-            description = action.get("description") or action.get("actionType")
+            team = get("teamTricode")
+            player = get("playerName") or get("playerNameI")
+            description = get("description") or get("actionType")
 
             if not team or not player or not description:
                 continue
 
+            person_id = get("personId")
             return {
                 "team": team,
                 "player": player,
-                "player_id": str(action.get("personId")) if action.get("personId") else None,
+                "player_id": str(person_id) if person_id else None,
                 "description": description,
-                "clock": action.get("clock", "12:00"),
-                "period": int(action.get("period", 1)),
-                "periodType": action.get("periodType", "REGULAR"),
+                "clock": get("clock", "12:00"),
+                "period": int(get("period", 1)),
+                "periodType": get("periodType", "REGULAR"),
             }
 
         return None
@@ -349,16 +663,15 @@ class NBAScraper:
         game: Dict,
         season_label: str,
         first_event: Dict,
+        scraped_at: str,
     ) -> Dict:
-        game_date = game.get("game_date")
+        # _should_process_game only lets through games with a date.
+        game_date = game["game_date"]
         if isinstance(game_date, datetime):
-            game_date_str = game_date.date().isoformat()
-        elif hasattr(game_date, "isoformat"):
-            game_date_str = game_date.isoformat()  # type: ignore[assignment]
-        else:
-            game_date_str = datetime.now().date().isoformat()
+            game_date = game_date.date()
+        game_date_str = game_date.isoformat()
 
-        elapsed = self._calculate_elapsed_seconds(
+        elapsed = _calculate_elapsed_seconds(
             first_event.get("clock", "12:00"),
             first_event.get("period", 1),
             first_event.get("periodType", "REGULAR"),
@@ -376,154 +689,167 @@ class NBAScraper:
             "first_scoring_description": first_event.get("description"),
             "first_scoring_elapsed": elapsed,
             "source_url": "nba_api.stats.playbyplayv2",
-            "last_updated": datetime.now(timezone.utc).isoformat(),
+            "last_updated": scraped_at,
         }
 
-    def _upsert_game_record(self, record: Dict) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO games (
-                    game_id,
-                    season,
-                    game_date,
-                    home_team,
-                    away_team,
-                    first_scoring_team,
-                    first_scoring_player,
-                    first_scoring_player_id,
-                    first_scoring_description,
-                    first_scoring_elapsed,
-                    source_url,
-                    last_updated
-                ) VALUES (:game_id, :season, :game_date, :home_team, :away_team, :first_scoring_team,
-                          :first_scoring_player, :first_scoring_player_id, :first_scoring_description,
-                          :first_scoring_elapsed, :source_url, :last_updated)
-                ON CONFLICT(game_id) DO UPDATE SET
-                    season = excluded.season,
-                    game_date = excluded.game_date,
-                    home_team = excluded.home_team,
-                    away_team = excluded.away_team,
-                    first_scoring_team = excluded.first_scoring_team,
-                    first_scoring_player = excluded.first_scoring_player,
-                    first_scoring_player_id = excluded.first_scoring_player_id,
-                    first_scoring_description = excluded.first_scoring_description,
-                    first_scoring_elapsed = excluded.first_scoring_elapsed,
-                    source_url = excluded.source_url,
-                    last_updated = excluded.last_updated
-                """,
-                record,
-            )
+    def _upsert_game_records(self, records: List[Dict]) -> None:
+        """Upsert a batch of game records and commit them as one transaction.
 
-    def _export_season_files(self, season_label: str) -> None:
-        games = self._load_games_from_db(season_label)
-        games_path = os.path.join(self.data_dir, f"games_{season_label}.json")
-        with open(games_path, "w", encoding="utf-8") as file:
-            json.dump(games, file, indent=2)
+        The stored ids are added to ``_processed_ids`` so the in-memory set
+        keeps matching the table.
+        """
+        if not records:
+            return
+        with self._conn as conn:
+            conn.executemany(UPSERT_GAME_SQL, records)
+        self._processed_ids.update(record["game_id"] for record in records)
+
+    def _export_season_files(self, season_label: str) -> Future:
+        """Export the season's JSON snapshots on the background writer.
+
+        The database is read on the calling thread, the only one that uses the
+        connection; encoding and writing happen on ``_io_pool``. The returned
+        future resolves to a digest of both files' contents. Snapshots are
+        rebuilt from the database on every run so a failed write or a format
+        change is repaired next time; unchanged files are left untouched.
+        """
 
-        players = self._build_player_summary(season_label)
+        games_path = os.path.join(self.data_dir, f"games_{season_label}.json")
         players_path = os.path.join(self.data_dir, f"players_{season_label}.json")
-        with open(players_path, "w", encoding="utf-8") as file:
-            json.dump(players, file, indent=2)
 
-    def _load_games_from_db(self, season_label: str) -> List[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                "SELECT * FROM games WHERE season = ? ORDER BY game_date",
-                (season_label,),
-            ).fetchall()
+        snapshots = (
+            (games_path, self._load_games_from_db(season_label)),
+            (players_path, self._build_player_summary(season_label)),
+        )
+        return self._io_pool.submit(self._write_snapshots, snapshots)
+
+    def _write_snapshots(self, snapshots: Sequence[Tuple[str, List[Dict]]]) -> bytes:
+        digest = hashlib.sha256()
+        for path, payload in snapshots:
+            digest.update(self._write_json(path, payload))
+        return digest.digest()
+
+    def _write_json(self, path: str, payload: List[Dict]) -> bytes:
+        if orjson is not None:
+            encoded = orjson.dumps(payload, option=orjson.OPT_INDENT_2 if PRETTY_JSON else 0)
+        elif PRETTY_JSON:
+            encoded = json.dumps(payload, indent=2).encode("utf-8")
+        else:
+            encoded = json.dumps(payload, separators=(",", ":")).encode("utf-8")
 
-        games: List[Dict] = []
-        for row in rows:
-            games.append(
-                {
-                    "game_id": row["game_id"],
-                    "date": row["game_date"],
-                    "home_team": row["home_team"],
-                    "away_team": row["away_team"],
-                    "first_basket_player": row["first_scoring_player"],
-                    "first_basket_team": row["first_scoring_team"],
-                    "first_basket_time": row["first_scoring_elapsed"],
-                    "play_description": row["first_scoring_description"],
-                    "source_url": row["source_url"],
-                }
-            )
-        return games
+        # Leave identical snapshots untouched so their mtime, and with it the
+        # predictor's cached model, stays valid.
+        try:
+            with open(path, "rb") as file:
+                if file.read() == encoded:
+                    return encoded
+        except OSError:
+            pass
+
+        # Publish atomically: readers see either the old snapshot or the
+        # complete new one, never a half-written file.
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(encoded)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+        return encoded
+
+    def _load_games_from_db(self, season_label: str) -> List[Dict]:
+        rows = self._conn.execute(
+            """
+            SELECT game_id,
+                   game_date,
+                   home_team,
+                   away_team,
+                   first_scoring_player,
+                   first_scoring_team,
+                   first_scoring_elapsed,
+                   first_scoring_description,
+                   source_url
+            FROM games
+            WHERE season = ?
+            ORDER BY game_date
+            """,
+            (season_label,),
+        ).fetchall()
+
+        # Plain tuples unpacked positionally are cheaper than sqlite3.Row
+        # lookups or dict(row) for what is the largest export.
+        return [
+            {
+                "game_id": game_id,
+                "date": game_date,
+                "home_team": home_team,
+                "away_team": away_team,
+                "first_basket_player": player,
+                "first_basket_team": team,
+                "first_basket_time": elapsed,
+                "play_description": description,
+                "source_url": source_url,
+            }
+            for (
+                game_id,
+                game_date,
+                home_team,
+                away_team,
+                player,
+                team,
+                elapsed,
+                description,
+                source_url,
+            ) in rows
+        ]
 
     def _build_player_summary(self, season_label: str) -> List[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            player_rows = conn.execute(
-                """
-                SELECT first_scoring_player AS player,
-                       first_scoring_player_id AS player_id,
-                       first_scoring_team AS team,
-                       COUNT(*) AS first_baskets,
-                       AVG(first_scoring_elapsed) AS avg_elapsed
+        # team_games unpivots home/away in a single pass over the season (the
+        # CROSS JOIN keeps ``games`` as the outer loop); the join then drops
+        # teams without games. Rounding stays in Python, whose round() differs
+        # from SQLite's ROUND on halfway values.
+        cursor = self._conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        rows = cursor.execute(
+            """
+            WITH team_games AS (
+                SELECT CASE side.is_home WHEN 1 THEN games.home_team ELSE games.away_team END
+                           AS team,
+                       COUNT(*) AS games_played
                 FROM games
-                WHERE season = ? AND first_scoring_team IS NOT NULL
-                GROUP BY first_scoring_player, first_scoring_player_id, first_scoring_team
-                ORDER BY team, first_baskets DESC
-                """,
-                (season_label,),
-            ).fetchall()
-
-            team_rows = conn.execute(
-                """
-                SELECT team, COUNT(*) AS games_played
-                FROM (
-                    SELECT home_team AS team FROM games WHERE season = ?
-                    UNION ALL
-                    SELECT away_team AS team FROM games WHERE season = ?
-                )
+                CROSS JOIN (SELECT 1 AS is_home UNION ALL SELECT 0) AS side
+                WHERE games.season = :season
                 GROUP BY team
-                """,
-                (season_label, season_label),
-            ).fetchall()
-
-        team_games = {row["team"]: row["games_played"] for row in team_rows}
-
-        players: List[Dict] = []
-        for row in player_rows:
-            team = row["team"]
-            games_played = team_games.get(team, 0)
-            if games_played == 0:
-                continue
-
-            probability = row["first_baskets"] / games_played
-            player_id = row["player_id"] or f"{team}_{row['player']}"
-            players.append(
-                {
-                    "player_id": str(player_id),
-                    "name": row["player"],
-                    "team": team,
-                    "position": None,
-                    "avg_first_basket_time": round(row["avg_elapsed"] or 0, 2),
-                    "first_basket_probability": round(probability, 4),
-                    "games_played": games_played,
-                    "first_baskets": row["first_baskets"],
-                }
             )
-
-        return players
-
-    def _calculate_elapsed_seconds(self, clock: str, period: int, period_type: str) -> float:
-        try:
-            minutes_str, seconds_str = clock.split(":")
-            minutes = int(minutes_str)
-            seconds = float(seconds_str)
-        except (ValueError, AttributeError):
-            minutes = 12
-            seconds = 0.0
-
-        period_length = 12 * 60
-        if period > 4 or str(period_type).upper() == "OVERTIME":
-            period_length = 5 * 60
-
-        elapsed_in_period = period_length - (minutes * 60 + seconds)
-        total_elapsed = elapsed_in_period + max(0, period - 1) * 12 * 60
-        return round(total_elapsed, 2)
+            SELECT games.first_scoring_player AS player,
+                   games.first_scoring_player_id AS player_id,
+                   games.first_scoring_team AS team,
+                   COUNT(*) AS first_baskets,
+                   AVG(games.first_scoring_elapsed) AS avg_elapsed,
+                   team_games.games_played AS games_played
+            FROM games
+            JOIN team_games ON team_games.team = games.first_scoring_team
+            WHERE games.season = :season
+            GROUP BY games.first_scoring_player,
+                     games.first_scoring_player_id,
+                     games.first_scoring_team
+            ORDER BY team, first_baskets DESC
+            """,
+            {"season": season_label},
+        ).fetchall()
+
+        return [
+            {
+                "player_id": str(row["player_id"] or f"{row['team']}_{row['player']}"),
+                "name": row["player"],
+                "team": row["team"],
+                "position": None,
+                "avg_first_basket_time": round(row["avg_elapsed"] or 0, 2),
+                "first_basket_probability": round(row["first_baskets"] / row["games_played"], 4),
+                "games_played": row["games_played"],
+                "first_baskets": row["first_baskets"],
+            }
+            for row in rows
+        ]
 
     # ------------------------------------------------------------------
     # Today's games helpers
@@ -571,7 +897,7 @@ class NBAScraper:
             logger.error("balldontlie today's games request failed: %s", exc)
             return []
 
-        payload = response.json()
+        payload = _decode_json(response)
         games: List[Dict] = []
         for game in payload.get("data", []):
             games.append(